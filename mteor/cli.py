@@ -117,29 +117,54 @@ Arguments:
 """
 
 import logging
-import os
 
-import MetaTrader5 as Mt5
 from docopt import docopt
 
 from . import __version__
-from .info import (print_deals, print_margins, print_mt5_info, print_orders,
-                   print_positions, print_rates, print_symbol_info,
-                   print_ticks)
-from .order import close_positions
-from .trader import AutoTrader
-from .util import Mt5ResponseError, set_log_config
+
+
+def _build_command_runners():
+    from .info import (print_deals, print_margins, print_mt5_info,
+                       print_orders, print_positions, print_rates,
+                       print_symbol_info, print_ticks)
+    from .order import close_positions
+    return {
+        'mt5': lambda args: print_mt5_info(),
+        'symbol': lambda args:
+        print_symbol_info(symbol=args['<instrument>'][0]),
+        'rate': lambda args: print_rates(
+            symbol=args['<instrument>'][0], granularity=args['--granularity'],
+            count=args['--count'], csv_path=args['--csv']
+        ),
+        'tick': lambda args: print_ticks(
+            symbol=args['<instrument>'][0], seconds=args['--seconds'],
+            date_to=args['--date-to'], csv_path=args['--csv'],
+            thin=args['--thin']
+        ),
+        'margin': lambda args: print_margins(symbol=args['<instrument>'][0]),
+        'position': lambda args: print_positions(),
+        'order': lambda args: print_orders(),
+        'deal': lambda args: print_deals(
+            hours=args['--hours'], date_to=args['--date-to']
+        ),
+        'close': lambda args: close_positions(
+            symbols=args['<instrument>'], dry_run=args['--dry-run']
+        )
+    }
 
 
 def main():
     args = docopt(__doc__, version=f'mteor {__version__}')
+    from .util import set_log_config
     set_log_config(debug=args['--debug'], info=args['--info'])
     logger = logging.getLogger(__name__)
-    logger.debug(f'args:{os.linesep}{args}')
+    logger.debug('args:\n%s', args)
+    import MetaTrader5 as Mt5
     try:
         _initialize_mt5(args=args)
         if args.get('open'):
             logger.info('Autonomous trading')
+            from .trader import AutoTrader
             AutoTrader(
                 symbols=args['<instrument>'],
                 betting_strategy=args['--betting-strategy'],
@@ -164,58 +189,31 @@ def main():
                 retry_count=args['--retry-count'], quiet=args['--quiet'],
                 dry_run=args['--dry-run']
             ).invoke()
-        elif args['mt5']:
-            print_mt5_info()
-        elif args['symbol']:
-            print_symbol_info(symbol=args['<instrument>'][0])
-        elif args['rate']:
-            print_rates(
-                symbol=args['<instrument>'][0],
-                granularity=args['--granularity'], count=args['--count'],
-                csv_path=args['--csv']
-            )
-        elif args['tick']:
-            print_ticks(
-                symbol=args['<instrument>'][0], seconds=args['--seconds'],
-                date_to=args['--date-to'], csv_path=args['--csv'],
-                thin=args['--thin']
-            )
-        elif args['margin']:
-            print_margins(symbol=args['<instrument>'][0])
-        elif args['position']:
-            print_positions()
-        elif args['order']:
-            print_orders()
-        elif args['deal']:
-            print_deals(hours=args['--hours'], date_to=args['--date-to'])
-        elif args['close']:
-            close_positions(
-                symbols=args['<instrument>'], dry_run=args['--dry-run']
-            )
         else:
-            pass
+            command_runners = _build_command_runners()
+            command = next(
+                (c for c in command_runners if args[c]), None
+            )
+            if command:
+                command_runners[command](args)
     except Exception as e:
-        logger.error('Mt5.last_error(): {}'.format(Mt5.last_error()))
+        logger.error('Mt5.last_error(): %s', Mt5.last_error())
         raise e
     finally:
         Mt5.shutdown()
 
 
+_MT5_INITIALIZE_KWARGS = [
+    ('path', str, '--mt5-exe'), ('login', int, '--mt5-login'),
+    ('password', str, '--mt5-password'), ('server', str, '--mt5-server')
+]
+
+
 def _initialize_mt5(args):
+    import MetaTrader5 as Mt5
+    from .util import Mt5ResponseError
     initialize_kwargs = {
-        **({'path': args['--mt5-exe']} if args['--mt5-exe'] else dict()),
-        **(
-            {'login': int(args['--mt5-login'])}
-            if args['--mt5-login'] else dict()
-        ),
-        **(
-            {'password': args['--mt5-password']}
-            if args['--mt5-password'] else dict()
-        ),
-        **(
-            {'server': args['--mt5-server']}
-            if args['--mt5-server'] else dict()
-        )
+        k: cast(args[o]) for k, cast, o in _MT5_INITIALIZE_KWARGS if args[o]
     }
     if not Mt5.initialize(**initialize_kwargs):
         raise Mt5ResponseError('MetaTrader5.initialize() failed.')
@@ -3,12 +3,26 @@
 import logging
 import os
 from datetime import datetime, timedelta
+from operator import attrgetter
 
 import MetaTrader5 as Mt5
 import pandas as pd
 
 from .util import print_df, print_json
 
+_TIMEFRAME_MAP = {
+    n.split('_', 1)[1]: getattr(Mt5, n) for n in dir(Mt5)
+    if n.startswith('TIMEFRAME_')
+}
+
+
+def _asdicts(records):
+    if not records:
+        return list()
+    fields = records[0]._fields
+    getter = attrgetter(*fields)
+    return [dict(zip(fields, getter(r))) for r in records]
+
 
 def print_deals(hours, date_to=None, group=None):
     logger = logging.getLogger(__name__)
@@ -19,22 +33,22 @@ def print_deals(hours, date_to=None, group=None):
         (end_date - timedelta(hours=float(hours))), end_date,
         **({'group': group} if group else dict())
     )
-    logger.debug(f'deals: {deals}')
-    print_json([d._asdict() for d in deals])
+    logger.debug('deals: %s', deals)
+    print_json(_asdicts(deals))
 
 
 def print_orders():
     logger = logging.getLogger(__name__)
     orders = Mt5.orders_get()
-    logger.debug(f'orders: {orders}')
-    print_json([o._asdict() for o in orders])
+    logger.debug('orders: %s', orders)
+    print_json(_asdicts(orders))
 
 
 def print_positions():
     logger = logging.getLogger(__name__)
     positions = Mt5.positions_get()
-    logger.debug(f'positions: {positions}')
-    print_json([p._asdict() for p in positions])
+    logger.debug('positions: %s', positions)
+    print_json(_asdicts(positions))
 
 
 def print_margins(symbol):
@@ -45,7 +59,7 @@ def print_margins(symbol):
     volume_min = Mt5.symbol_info(symbol).volume_min
     logger.info(f'volume_min: {volume_min}')
     symbol_info_tick = Mt5.symbol_info_tick(symbol)
-    logger.debug(f'symbol_info_tick: {symbol_info_tick}')
+    logger.debug('symbol_info_tick: %s', symbol_info_tick)
     ask_margin = Mt5.order_calc_margin(
         Mt5.ORDER_TYPE_BUY, symbol, volume_min, symbol_info_tick.ask
     )
@@ -76,10 +90,8 @@ def print_ticks(symbol, seconds, date_to=None, csv_path=None, thin=False):
 
 
 def _thin_df_tick(df_tick):
-    return df_tick.reset_index()[['time', 'bid', 'ask']].groupby('time').pipe(
-        lambda g: g.tail(1).set_index('time').join(
-            g.size().to_frame('tick_volume'), how='left'
-        )
+    return df_tick.groupby(level='time', sort=False).agg(
+        bid=('bid', 'last'), ask=('ask', 'last'), tick_volume=('bid', 'size')
     )
 
 
@@ -91,7 +103,7 @@ def _fetch_df_tick(symbol, seconds, date_to=None):
         start_date = end_date - delta
     else:
         symbol_info_tick = Mt5.symbol_info_tick(symbol)
-        logger.debug(f'symbol_info_tick: {symbol_info_tick}')
+        logger.debug('symbol_info_tick: %s', symbol_info_tick)
         last_tick_time = pd.to_datetime(symbol_info_tick.time, unit='s')
         end_date = last_tick_time + delta
         start_date = last_tick_time - delta
@@ -99,11 +111,19 @@ def _fetch_df_tick(symbol, seconds, date_to=None):
     ticks = Mt5.copy_ticks_range(
         symbol, start_date, end_date, Mt5.COPY_TICKS_ALL
     )
-    logger.debug(f'ticks: {ticks}')
-    return pd.DataFrame(ticks).assign(
-        time=lambda d: pd.to_datetime(d['time'], unit='s'),
-        time_msc=lambda d: pd.to_datetime(d['time_msc'], unit='ms')
-    ).set_index(['time', 'time_msc'])
+    logger.debug('ticks: %s', ticks)
+    df_tick = pd.DataFrame({
+        n: ticks[n] for n in ticks.dtype.names
+        if n not in {'time', 'time_msc'}
+    })
+    df_tick.index = pd.MultiIndex.from_arrays(
+        [
+            ticks['time'].astype('datetime64[s]'),
+            ticks['time_msc'].astype('datetime64[ms]')
+        ],
+        names=['time', 'time_msc']
+    )
+    return df_tick
 
 
 def print_rates(symbol, granularity, count, start_pos=0, csv_path=None):
@@ -123,22 +143,24 @@ def print_rates(symbol, granularity, count, start_pos=0, csv_path=None):
 
 def _fetch_df_rate(symbol, granularity, count, start_pos=0):
     logger = logging.getLogger(__name__)
-    timeframe = getattr(Mt5, f'TIMEFRAME_{granularity}')
+    timeframe = _TIMEFRAME_MAP.get(granularity)
+    if timeframe is None:
+        raise ValueError(f'invalid granularity: {granularity}')
     logger.info(f'Mt5.TIMEFRAME_{granularity}: {timeframe}')
     rates = Mt5.copy_rates_from_pos(symbol, timeframe, start_pos, int(count))
-    logger.debug(f'rates: {rates}')
+    logger.debug('rates: %s', rates)
     return pd.DataFrame(rates).assign(
-        time=lambda d: pd.to_datetime(d['time'], unit='s')
-    ).set_index('time')
+        time=lambda d: d['time'].astype('datetime64[s]')
+    )
 
 
 def print_symbol_info(symbol):
     logger = logging.getLogger(__name__)
     logger.info(f'symbol: {symbol}')
     symbol_info = Mt5.symbol_info(symbol)
-    logger.debug(f'symbol_info: {symbol_info}')
+    logger.debug('symbol_info: %s', symbol_info)
     symbol_info_tick = Mt5.symbol_info_tick(symbol)
-    logger.debug(f'symbol_info_tick: {symbol_info_tick}')
+    logger.debug('symbol_info_tick: %s', symbol_info_tick)
     print_json({
         'symbol': symbol, 'info': symbol_info._asdict(),
         'tick': symbol_info_tick._asdict()
@@ -150,7 +172,7 @@ def print_mt5_info():
     logger.info(f'Mt5.__version__: {Mt5.__version__}')
     logger.info(f'Mt5.__author__: {Mt5.__author__}')
     terminal_version = Mt5.version()
-    logger.debug(f'terminal_version: {terminal_version}')
+    logger.debug('terminal_version: %s', terminal_version)
     print(
         os.linesep.join([
             f'{k}: {v}' for k, v in zip(
@@ -163,14 +185,14 @@ def print_mt5_info():
         ])
     )
     terminal_info = Mt5.terminal_info()
-    logger.debug(f'terminal_info: {terminal_info}')
+    logger.debug('terminal_info: %s', terminal_info)
     print(
         f'Terminal status and settings:{os.linesep}' + os.linesep.join([
             f'  {k}: {v}' for k, v in terminal_info._asdict().items()
         ])
     )
     account_info = Mt5.account_info()
-    logger.debug(f'account_info: {account_info}')
+    logger.debug('account_info: %s', account_info)
     print(
         f'Trading account info:{os.linesep}' + os.linesep.join([
             f'  {k}: {v}' for k, v in account_info._asdict().items()
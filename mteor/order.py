@@ -1,57 +1,68 @@
 #!/usr/bin/env python
 
 import logging
-import os
 from pprint import pformat
 
 import MetaTrader5 as Mt5
 
 from .util import Mt5ResponseError, print_json
 
+_ORDER_FUNCS = {
+    True: ('order_check', Mt5.order_check),
+    False: ('order_send', Mt5.order_send)
+}
+
+
+def _response_to_dict(result):
+    response = result._asdict()
+    response['request'] = result.request._asdict()
+    return response
+
 
 def close_positions(symbols, dry_run=False):
     logger = logging.getLogger(__name__)
     logger.info(f'symbols: {symbols}, dry_run: {dry_run}')
+    base_request = {
+        'action': Mt5.TRADE_ACTION_DEAL,
+        'type_filling': Mt5.ORDER_FILLING_FOK,
+        'type_time': Mt5.ORDER_TIME_GTC
+    }
+    requests = list()
     for s in symbols:
         positions = Mt5.positions_get(symbol=s)
-        logger.debug(f'positions: {positions}')
+        logger.debug('positions: %s', positions)
         if not positions:
             logger.info(f'No position for {s}.')
         else:
-            for p in positions:
-                _send_or_check_order(
-                    request={
-                        'action': Mt5.TRADE_ACTION_DEAL,
-                        'symbol': p.symbol, 'volume': p.volume,
-                        'type': (
-                            Mt5.ORDER_TYPE_SELL
-                            if p.type == Mt5.POSITION_TYPE_BUY
-                            else Mt5.ORDER_TYPE_BUY
-                        ),
-                        'type_filling': Mt5.ORDER_FILLING_FOK,
-                        'type_time': Mt5.ORDER_TIME_GTC,
-                        'position': p.ticket
-                    },
-                    only_check=dry_run
-                )
+            requests.extend([
+                {
+                    **base_request, 'symbol': p.symbol, 'volume': p.volume,
+                    'type': (
+                        Mt5.ORDER_TYPE_SELL
+                        if p.type == Mt5.POSITION_TYPE_BUY
+                        else Mt5.ORDER_TYPE_BUY
+                    ),
+                    'position': p.ticket
+                } for p in positions
+            ])
+    for request in requests:
+        _send_or_check_order(request=request, only_check=dry_run)
 
 
 def _send_or_check_order(request, only_check=False):
     logger = logging.getLogger(__name__)
-    logger.debug(f'request: {request}')
-    order_func = 'order_{}'.format('check' if only_check else 'send')
-    result = getattr(Mt5, order_func)(request)
-    logger.debug(f'result: {result}')
-    response = {
-        k: (v._asdict() if k == 'request' else v)
-        for k, v in result._asdict().items()
-    }
+    logger.debug('request: %s', request)
+    order_func, send_or_check = _ORDER_FUNCS[bool(only_check)]
+    result = send_or_check(request)
+    logger.debug('result: %s', result)
+    response = _response_to_dict(result)
     print_json(response)
     if (((not only_check) and result.retcode == Mt5.TRADE_RETCODE_DONE)
             or (only_check and result.retcode == 0)):
-        logger.info(f'response:{os.linesep}' + pformat(response))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('response:\n%s', pformat(response))
     else:
-        logger.error(f'response:{os.linesep}' + pformat(response))
+        logger.error('response:\n%s', pformat(response))
         raise Mt5ResponseError(
             f'Mt5.{order_func}() failed. <= `{result.comment}`'
         )
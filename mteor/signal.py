@@ -1,12 +1,20 @@
 #!/usr/bin/env python
 
 import logging
-import os
 from pprint import pformat
 
 import numpy as np
+import pandas as pd
 import scipy.stats as scs
 
+_LOG_STR_FMT = '{0:^36}|{1:^32}|'
+
+_SIG_KEYS = [
+    'bid', 'ask', 'tick_volume', 'log_return', 'delta_sec', 'volume_weight',
+    'log_return_rate', 'pl_ratio', 'sharpe_ratio', 'sr_ema', 'sr_emse',
+    'lrr_ema', 'lrr_emse'
+]
+
 
 class SignalDetector(object):
     def __init__(self, lrr_ema_span=1000, sr_ema_span=1000,
@@ -16,32 +24,32 @@ class SignalDetector(object):
         self.sr_ema_span = sr_ema_span
         self.significance_level = significance_level
         self.volume_factor = volume_factor
-        self.__logger.debug('vars(self):' + os.linesep + pformat(vars(self)))
-
-    def detect(self, df_tick, position_side=None):
-        df_sig = self._calculate_log_return_rate(
-            df_sr=self._calculate_sharpe_ratio(
-                df_tick=df_tick, span=self.sr_ema_span,
-                volume_factor=self.volume_factor
-            ),
-            span=self.lrr_ema_span
+        self._lrr_t_crit = scs.t.ppf(
+            (1 - self.significance_level / 2), df=(self.lrr_ema_span - 1)
         )
-        sig = (
-            df_sig.iloc[-1].to_dict() if df_sig.shape[0] > 0
-            else {c: np.nan for c in df_sig.columns}
+        self._sr_t_crit = scs.t.ppf(
+            (1 - self.significance_level / 2), df=(self.sr_ema_span - 1)
         )
-        self.__logger.debug(f'sig: {sig}')
+        if self.__logger.isEnabledFor(logging.DEBUG):
+            self.__logger.debug('vars(self):\n%s', pformat(vars(self)))
+
+    def detect(self, df_tick, position_side=None):
+        if df_tick.shape[0] <= max(self.lrr_ema_span, self.sr_ema_span):
+            sig = {k: np.nan for k in _SIG_KEYS}
+        else:
+            sig = self._calculate_signal_values(
+                df_tick=df_tick, lrr_ema_span=self.lrr_ema_span,
+                sr_ema_span=self.sr_ema_span, volume_factor=self.volume_factor
+            )
+        self.__logger.debug('sig: %s', sig)
         lrr_ema_ci = self._calculate_ci(
-            alpha=(1 - self.significance_level), df=(self.lrr_ema_span - 1),
-            loc=sig['lrr_ema'], scale=sig['lrr_emse']
+            t_crit=self._lrr_t_crit, loc=sig['lrr_ema'], scale=sig['lrr_emse']
         )
-        self.__logger.debug(f'lrr_ema_ci: {lrr_ema_ci}')
+        self.__logger.debug('lrr_ema_ci: %s', lrr_ema_ci)
         sr_ema_ci = self._calculate_ci(
-            alpha=(1 - self.significance_level),
-            df=(self.sr_ema_span - 1), loc=sig['sr_ema'],
-            scale=sig['sr_emse']
+            t_crit=self._sr_t_crit, loc=sig['sr_ema'], scale=sig['sr_emse']
         )
-        self.__logger.debug(f'sr_ema_ci: {sr_ema_ci}')
+        self.__logger.debug('sr_ema_ci: %s', sr_ema_ci)
         if ((sr_ema_ci[0] > 0 and sig['lrr_ema'] > 0)
                 or (lrr_ema_ci[0] > 0 and sig['sr_ema'] > 0)):
             act = 'long'
@@ -57,67 +65,69 @@ class SignalDetector(object):
             act = 'closing'
         else:
             act = None
-        self.__logger.debug(f'act: {act}')
+        self.__logger.debug('act: %s', act)
         return {
             'act': act, **sig, 'lrr_ema_ci_lower': lrr_ema_ci[0],
             'lrr_ema_ci_upper': lrr_ema_ci[1], 'sr_ema_ci_lower': sr_ema_ci[0],
             'sr_ema_ci_upper': sr_ema_ci[1],
-            'log_str': '{0:^36}|{1:^32}|'.format(
+            'log_str': _LOG_STR_FMT.format(
                 'LRR:{0:>10}{1:>18}'.format(
                     '{:.1g}'.format(sig['lrr_ema']),
-                    np.array2string(
-                        lrr_ema_ci,
-                        formatter={'float_kind': lambda f: f'{f:.1g}'}
-                    )
+                    '[{0:.1g} {1:.1g}]'.format(lrr_ema_ci[0], lrr_ema_ci[1])
                 ),
                 'SR:{0:>9}{1:>16}'.format(
                     '{:.1g}'.format(sig['sr_ema']),
-                    np.array2string(
-                        sr_ema_ci,
-                        formatter={'float_kind': lambda f: f'{f:.1g}'}
-                    )
+                    '[{0:.1g} {1:.1g}]'.format(sr_ema_ci[0], sr_ema_ci[1])
                 )
             )
         }
 
     @staticmethod
-    def _calculate_sharpe_ratio(df_tick, span, volume_factor=0):
-        return df_tick.assign(
-            log_return=lambda d: np.log(d[['ask', 'bid']].mean(axis=1)).diff(),
-            delta_sec=lambda d: d.index.to_series().diff().dt.total_seconds(),
-            volume_weight=lambda d: np.power(
-                d['tick_volume'], volume_factor
-            ).pipe(lambda s: (s / s.mean()))
-        ).assign(
-            log_return_rate=lambda d:
-            (d['log_return'] / d['delta_sec'] * d['volume_weight']).fillna(0)
-        ).assign(
-            pl_ratio=lambda d: (np.exp(d['log_return_rate']) - 1)
-        ).assign(
-            sharpe_ratio=lambda d: (
-                d['pl_ratio'] * d['bid'] / d['ask']
-                / d['pl_ratio'].rolling(window=span).std(ddof=1)
-            )
-        ).assign(
-            sr_ema=lambda d:
-            d['sharpe_ratio'].ewm(span=span, adjust=False).mean(),
-            sr_emse=lambda d: np.sqrt(
-                d['sharpe_ratio'].ewm(span=span, adjust=False).var(ddof=1)
-                / span
-            )
+    def _calculate_signal_values(df_tick, lrr_ema_span, sr_ema_span,
+                                 volume_factor=0):
+        if df_tick.shape[0] == 0:
+            return {k: np.nan for k in _SIG_KEYS}
+        bid = df_tick['bid'].to_numpy(dtype=np.float64)
+        ask = df_tick['ask'].to_numpy(dtype=np.float64)
+        tick_volume = df_tick['tick_volume'].to_numpy(dtype=np.float64)
+        time_nsec = df_tick.index.to_numpy().astype('datetime64[ns]')
+        log_mid = np.log((ask + bid) / 2)
+        log_return = np.full_like(log_mid, np.nan)
+        log_return[1:] = np.diff(log_mid)
+        delta_sec = np.full_like(log_mid, np.nan)
+        delta_sec[1:] = np.diff(time_nsec).astype(np.int64) / 1e9
+        volume_weight = np.power(tick_volume, volume_factor)
+        volume_weight /= volume_weight.mean()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_return_rate = log_return / delta_sec * volume_weight
+        log_return_rate[np.isnan(log_return_rate)] = 0
+        pl_ratio = np.expm1(log_return_rate)
+        pl_ratio_sd = pd.Series(pl_ratio).rolling(
+            window=sr_ema_span
+        ).std(ddof=1).to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe_ratio = pl_ratio * bid / ask / pl_ratio_sd
+        sr_ewm = pd.Series(sharpe_ratio).ewm(span=sr_ema_span, adjust=False)
+        lrr_ewm = pd.Series(log_return_rate).ewm(
+            span=lrr_ema_span, adjust=False
         )
-
-    @staticmethod
-    def _calculate_log_return_rate(df_sr, span):
-        return df_sr.assign(
-            lrr_ema=lambda d:
-            d['log_return_rate'].ewm(span=span, adjust=False).mean(),
-            lrr_emse=lambda d: np.sqrt(
-                d['log_return_rate'].ewm(span=span, adjust=False).var(ddof=1)
-                / span
+        return {
+            'bid': bid[-1], 'ask': ask[-1], 'tick_volume': tick_volume[-1],
+            'log_return': log_return[-1], 'delta_sec': delta_sec[-1],
+            'volume_weight': volume_weight[-1],
+            'log_return_rate': log_return_rate[-1],
+            'pl_ratio': pl_ratio[-1], 'sharpe_ratio': sharpe_ratio[-1],
+            'sr_ema': sr_ewm.mean().iloc[-1],
+            'sr_emse': np.sqrt(
+                sr_ewm.var(ddof=1).iloc[-1] / sr_ema_span
+            ),
+            'lrr_ema': lrr_ewm.mean().iloc[-1],
+            'lrr_emse': np.sqrt(
+                lrr_ewm.var(ddof=1).iloc[-1] / lrr_ema_span
             )
-        )
+        }
 
     @staticmethod
-    def _calculate_ci(*args, **kwargs):
-        return np.array(scs.t.interval(*args, **kwargs))
+    def _calculate_ci(t_crit, loc, scale):
+        margin = t_crit * scale
+        return np.array([loc - margin, loc + margin])
@@ -1,22 +1,43 @@
 #!/usr/bin/env python
 
 import logging
-import os
 import signal
 import time
-from datetime import timedelta
+from datetime import datetime, timedelta
 from math import floor
 from pprint import pformat
 
 import MetaTrader5 as Mt5
 import numpy as np
 import pandas as pd
-import scipy.stats as scs
 
 from .bet import BettingSystem
 from .signal import SignalDetector
 from .util import Mt5ResponseError
 
+_SYMBOL_INFO_TTL_SECONDS = 60
+
+_TIMEFRAME_MAP = {
+    n.split('_', 1)[1]: getattr(Mt5, n) for n in dir(Mt5)
+    if n.startswith('TIMEFRAME_')
+}
+
+_CLOSING_ORDER_TYPES = {
+    Mt5.POSITION_TYPE_BUY: Mt5.ORDER_TYPE_SELL,
+    Mt5.POSITION_TYPE_SELL: Mt5.ORDER_TYPE_BUY
+}
+
+_ORDER_SIDE_TYPES = {'long': Mt5.ORDER_TYPE_BUY, 'short': Mt5.ORDER_TYPE_SELL}
+
+_GRANULARITY_UNIT_SECONDS = {
+    'M': 60, 'H': 3600, 'D': 86400, 'W': 604800, 'MN': 2592000
+}
+
+
+def _granularity_to_seconds(granularity):
+    unit = ('MN' if granularity.startswith('MN') else granularity[0])
+    return _GRANULARITY_UNIT_SECONDS[unit] * int(granularity[len(unit):] or 1)
+
 
 class Mt5TraderCore(object):
     def __init__(self, symbol, betting_strategy='constant', history_hours=24,
@@ -27,7 +48,7 @@ class Mt5TraderCore(object):
         self.__logger = logging.getLogger(__name__)
         self.symbol = symbol
         self.betting_system = BettingSystem(strategy=betting_strategy)
-        self.__history_hours = float(history_hours)
+        self.__history_delta = timedelta(hours=float(history_hours))
         if unit_margin_ratio:
             self.__unit_margin_ratio = float(unit_margin_ratio)
             self.unit_volume = None
@@ -38,15 +59,35 @@ class Mt5TraderCore(object):
         self.__take_profit_limit_ratio = float(take_profit_limit_ratio)
         self.__stop_loss_limit_ratio = float(stop_loss_limit_ratio)
         self.__trailing_stop_limit_ratio = float(trailing_stop_limit_ratio)
+        self.__buy_trailing_sl_coef = 1 - self.__trailing_stop_limit_ratio
+        self.__sell_trailing_sl_coef = 1 + self.__trailing_stop_limit_ratio
+        self.__order_limit_params = {
+            'long': (
+                'ask', (1 - self.__stop_loss_limit_ratio),
+                (1 + self.__take_profit_limit_ratio)
+            ),
+            'short': (
+                'bid', (1 + self.__stop_loss_limit_ratio),
+                (1 - self.__take_profit_limit_ratio)
+            )
+        }
         self.__quiet = quiet
         self.__dry_run = dry_run
+        self.__order_func, self.__order_call = (
+            ('order_check', Mt5.order_check) if dry_run
+            else ('order_send', Mt5.order_send)
+        )
         self.account_info = None
         self.symbol_info = None
+        self.__symbol_info_caches = dict()
         self.symbol_info_tick = None
         self.positions = list()
         self.orders = list()
-        self.min_margins = dict()
+        self.min_ask_margin = None
+        self.min_bid_margin = None
+        self.__min_margin_key = None
         self.history_deals = list()
+        self.__history_deal_key = None
         self.last_tick_time = None
         self.unit_margin = None
         self.avail_margin = None
@@ -66,44 +107,52 @@ class Mt5TraderCore(object):
 
     def _refresh_account_info_cache(self):
         self.account_info = Mt5.account_info()
-        self.__logger.debug(f'self.account_info: {self.account_info}')
+        self.__logger.debug('self.account_info: %s', self.account_info)
         if not self.account_info:
             raise Mt5ResponseError('Mt5.account_info() failed.')
 
     def _refresh_symbol_info_cache(self):
+        cache = self.__symbol_info_caches.get(self.symbol)
+        now = time.monotonic()
+        if cache and (now - cache[0]) < _SYMBOL_INFO_TTL_SECONDS:
+            self.symbol_info = cache[1]
+            return
         self.symbol_info = Mt5.symbol_info(self.symbol)
-        self.__logger.debug(f'self.symbol_info: {self.symbol_info}')
+        self.__logger.debug('self.symbol_info: %s', self.symbol_info)
         if not self.symbol_info:
             raise Mt5ResponseError('Mt5.symbol_info() failed.')
+        else:
+            self.__symbol_info_caches[self.symbol] = (now, self.symbol_info)
 
     def _refresh_symbol_info_tick_cache(self):
         self.symbol_info_tick = Mt5.symbol_info_tick(self.symbol)
-        self.__logger.debug(f'self.symbol_info_tick: {self.symbol_info_tick}')
+        self.__logger.debug('self.symbol_info_tick: %s', self.symbol_info_tick)
         if not self.symbol_info_tick:
             raise Mt5ResponseError('Mt5.symbol_info_tick() failed.')
         else:
-            self.last_tick_time = pd.to_datetime(
-                self.symbol_info_tick.time, unit='s'
+            self.last_tick_time = datetime.utcfromtimestamp(
+                self.symbol_info_tick.time
             )
-            self.__logger.debug(f'self.last_tick_time: {self.last_tick_time}')
+            self.__logger.debug('self.last_tick_time: %s', self.last_tick_time)
 
     def _refresh_position_cache(self):
         self.positions = Mt5.positions_get(symbol=self.symbol)
-        self.__logger.debug(f'self.positions: {self.positions}')
+        self.__logger.debug('self.positions: %s', self.positions)
         if not isinstance(self.positions, tuple):
             raise Mt5ResponseError('Mt5.positions_get() failed.')
         elif not self.positions:
             self.position_volumes = {'long': 0, 'short': 0}
             self.position_side = None
         else:
-            long_volume = sum([
-                p.volume for p in self.positions
-                if p.type == Mt5.POSITION_TYPE_BUY
-            ])
-            short_volume = sum([
-                p.volume for p in self.positions
-                if p.type == Mt5.POSITION_TYPE_SELL
-            ])
+            buy_type = Mt5.POSITION_TYPE_BUY
+            sell_type = Mt5.POSITION_TYPE_SELL
+            long_volume = 0
+            short_volume = 0
+            for p in self.positions:
+                if p.type == buy_type:
+                    long_volume += p.volume
+                elif p.type == sell_type:
+                    short_volume += p.volume
             self.position_volumes = {
                 'long': long_volume, 'short': short_volume
             }
@@ -116,88 +165,104 @@ class Mt5TraderCore(object):
 
     def _refresh_order_cache(self):
         self.orders = Mt5.orders_get(symbol=self.symbol)
-        self.__logger.debug(f'self.orders: {self.orders}')
+        self.__logger.debug('self.orders: %s', self.orders)
         if not isinstance(self.orders, tuple):
             raise Mt5ResponseError('Mt5.orders_get() failed.')
 
     def _refresh_margin_cache(self):
+        key = (
+            self.symbol, self.symbol_info.volume_min,
+            self.symbol_info_tick.ask, self.symbol_info_tick.bid
+        )
+        if key == self.__min_margin_key:
+            return
         min_ask_margin = Mt5.order_calc_margin(
             Mt5.ORDER_TYPE_BUY, self.symbol, self.symbol_info.volume_min,
             self.symbol_info_tick.ask
         )
-        self.__logger.debug(f'min_ask_margin: {min_ask_margin}')
+        self.__logger.debug('min_ask_margin: %s', min_ask_margin)
         min_bid_margin = Mt5.order_calc_margin(
             Mt5.ORDER_TYPE_SELL, self.symbol, self.symbol_info.volume_min,
             self.symbol_info_tick.bid
         )
-        self.__logger.debug(f'min_bid_margin: {min_bid_margin}')
-        if all([min_ask_margin, min_bid_margin]):
-            self.min_margins = {'ask': min_ask_margin, 'bid': min_bid_margin}
+        self.__logger.debug('min_bid_margin: %s', min_bid_margin)
+        if min_ask_margin and min_bid_margin:
+            self.min_ask_margin = min_ask_margin
+            self.min_bid_margin = min_bid_margin
+            self.__min_margin_key = key
         else:
             raise Mt5ResponseError('Mt5.order_calc_margin() failed.')
 
     def _refresh_history_deal_cache(self):
-        date_from = (
-            self.last_tick_time - timedelta(hours=self.__history_hours)
+        key = (
+            self.symbol, tuple((p.ticket, p.volume) for p in self.positions)
         )
-        date_to = self.last_tick_time + timedelta(hours=self.__history_hours)
+        if key == self.__history_deal_key:
+            return
+        date_from = self.last_tick_time - self.__history_delta
+        date_to = self.last_tick_time + self.__history_delta
         self.history_deals = Mt5.history_deals_get(
             date_from, date_to, group=self.symbol
         )
         if not isinstance(self.history_deals, tuple):
             raise Mt5ResponseError('Mt5.history_deals_get() failed.')
+        else:
+            self.__history_deal_key = key
 
     def _refresh_unit_margin_and_volume(self):
+        min_ask_margin = self.min_ask_margin
+        volume_min = self.symbol_info.volume_min
+        equity = self.account_info.equity
         if self.__unit_margin_ratio:
             unit_lot = floor(
-                self.account_info.equity * self.__unit_margin_ratio
-                / self.min_margins['ask']
+                equity * self.__unit_margin_ratio / min_ask_margin
             )
-            self.unit_volume = self.symbol_info.volume_min * unit_lot
+            self.unit_volume = volume_min * unit_lot
         else:
-            unit_lot = floor(self.unit_volume / self.symbol_info.volume_min)
-        self.__logger.debug(f'self.unit_volume: {self.unit_volume}')
-        self.unit_margin = self.min_margins['ask'] * unit_lot
-        self.__logger.debug(f'self.unit_margin: {self.unit_margin}')
+            unit_lot = floor(self.unit_volume / volume_min)
+        self.__logger.debug('self.unit_volume: %s', self.unit_volume)
+        self.unit_margin = min_ask_margin * unit_lot
+        self.__logger.debug('self.unit_margin: %s', self.unit_margin)
         self.avail_margin = max(
             (
                 self.account_info.margin_free
-                - self.account_info.equity * self.__preserved_margin_ratio
+                - equity * self.__preserved_margin_ratio
             ),
             0
         )
-        self.__logger.debug(f'self.avail_margin: {self.avail_margin}')
+        self.__logger.debug('self.avail_margin: %s', self.avail_margin)
         self.avail_volume = (
-            floor(self.avail_margin / self.min_margins['ask'])
-            * self.symbol_info.volume_min
+            floor(self.avail_margin / min_ask_margin) * volume_min
         )
-        self.__logger.debug(f'self.avail_volume: {self.avail_volume}')
+        self.__logger.debug('self.avail_volume: %s', self.avail_volume)
 
-    def trail_and_update_stop_loss(self, **kwargs):
-        self._refresh_position_cache()
+    def trail_and_update_stop_loss(self, refresh=True, **kwargs):
+        if refresh:
+            self._refresh_position_cache()
         if not self.positions:
             self.__logger.info(f'No position for {self.symbol}.')
         else:
-            self._refresh_symbol_info_tick_cache()
+            if refresh:
+                self._refresh_symbol_info_tick_cache()
+            sell_type = Mt5.POSITION_TYPE_SELL
+            digits = self.symbol_info.digits
+            sell_sl = round(
+                (self.symbol_info_tick.bid * self.__sell_trailing_sl_coef),
+                digits
+            )
+            buy_sl = round(
+                (self.symbol_info_tick.ask * self.__buy_trailing_sl_coef),
+                digits
+            )
             for p in self.positions:
-                if p.type == Mt5.POSITION_TYPE_SELL:
-                    new_sl = round(
-                        (
-                            self.symbol_info_tick.bid
-                            * (1 + self.__trailing_stop_limit_ratio)
-                        ),
-                        self.symbol_info.digits
+                if p.type == sell_type:
+                    trailing_sl = (
+                        sell_sl if sell_sl < p.sl or p.sl == 0 else 0
                     )
-                    trailing_sl = (new_sl if new_sl < p.sl or p.sl == 0 else 0)
                 else:
-                    new_sl = round(
-                        (
-                            self.symbol_info_tick.ask
-                            * (1 - self.__trailing_stop_limit_ratio)
-                        ),
-                        self.symbol_info.digits
+                    trailing_sl = (
+                        buy_sl if buy_sl > p.sl or p.sl == 0 else 0
                     )
-                    trailing_sl = (new_sl if new_sl > p.sl or p.sl == 0 else 0)
                 if trailing_sl != 0:
                     self._send_or_check_order({
                         'action': Mt5.TRADE_ACTION_SLTP, 'symbol': p.symbol,
@@ -205,53 +270,60 @@ class Mt5TraderCore(object):
                         **kwargs
                     })
 
-    def close_positions(self, **kwargs):
-        self._refresh_position_cache()
+    def close_positions(self, refresh=True, **kwargs):
+        if refresh:
+            self._refresh_position_cache()
         if not self.positions:
             self.__logger.info(f'No position for {self.symbol}.')
         else:
+            base_request = {
+                'action': Mt5.TRADE_ACTION_DEAL,
+                'type_filling': Mt5.ORDER_FILLING_FOK,
+                'type_time': Mt5.ORDER_TIME_GTC, **kwargs
+            }
             for p in self.positions:
                 self._send_or_check_order({
-                    'action': Mt5.TRADE_ACTION_DEAL,
-                    'symbol': p.symbol, 'volume': p.volume,
-                    'type': (
-                        Mt5.ORDER_TYPE_SELL
-                        if p.type == Mt5.POSITION_TYPE_BUY
-                        else Mt5.ORDER_TYPE_BUY
-                    ),
-                    'type_filling': Mt5.ORDER_FILLING_FOK,
-                    'type_time': Mt5.ORDER_TIME_GTC,
-                    'position': p.ticket, **kwargs
+                    **base_request, 'symbol': p.symbol, 'volume': p.volume,
+                    'type': _CLOSING_ORDER_TYPES[p.type],
+                    'position': p.ticket
                 })
 
     def _send_or_check_order(self, request):
-        self.__logger.debug(f'request: {request}')
-        order_func = 'order_{}'.format('check' if self.__dry_run else 'send')
-        result = getattr(Mt5, order_func)(request)
-        self.__logger.debug(f'result: {result}')
-        response = {
-            k: (v._asdict() if k == 'request' else v)
-            for k, v in result._asdict().items()
-        }
+        self.__logger.debug('request: %s', request)
+        result = self.__order_call(request)
+        self.__logger.debug('result: %s', result)
         if (((not self.__dry_run) and result.retcode == Mt5.TRADE_RETCODE_DONE)
                 or (self.__dry_run and result.retcode == 0)):
-            self.__logger.info('response:' + os.linesep + pformat(response))
+            if not self.__dry_run:
+                self.__history_deal_key = None
+            if self.__logger.isEnabledFor(logging.INFO):
+                self.__logger.info(
+                    'response:\n%s', pformat(self._response_to_dict(result))
+                )
         else:
-            self.__logger.error('response:' + os.linesep + pformat(response))
+            self.__logger.error(
+                'response:\n%s', pformat(self._response_to_dict(result))
+            )
             raise Mt5ResponseError(
-                f'Mt5.{order_func}() failed. <= `{result.comment}`'
+                f'Mt5.{self.__order_func}() failed. <= `{result.comment}`'
             )
 
+    @staticmethod
+    def _response_to_dict(result):
+        response = result._asdict()
+        response['request'] = result.request._asdict()
+        return response
+
     def design_and_place_order(self, act):
         if (self.position_side and act
                 and (act == 'closing' or act != self.position_side)):
             self.__logger.info(f'Close a position: {self.position_side}')
-            self.close_positions()
+            self.close_positions(refresh=False)
         elif self.position_side:
             self.__logger.info(
                 f'Update a position stop loss: {self.position_side}'
             )
-            self.trail_and_update_stop_loss()
+            self.trail_and_update_stop_loss(refresh=False)
         if act in ['long', 'short']:
             order_limits = self._determine_order_limits(side=act)
             order_volume = self._determine_order_volume()
@@ -272,38 +344,27 @@ class Mt5TraderCore(object):
 
     def _determine_order_limits(self, side):
         self._refresh_symbol_info_tick_cache()
-        if side == 'long':
-            sl = self.symbol_info_tick.ask * (1 - self.__stop_loss_limit_ratio)
-            tp = (
-                self.symbol_info_tick.ask
-                * (1 + self.__take_profit_limit_ratio)
-            )
-        elif side == 'short':
-            sl = self.symbol_info_tick.bid * (1 + self.__stop_loss_limit_ratio)
-            tp = (
-                self.symbol_info_tick.bid
-                * (1 - self.__take_profit_limit_ratio)
-            )
+        params = self.__order_limit_params.get(side)
+        if params:
+            price = getattr(self.symbol_info_tick, params[0])
+            order_limits = {'sl': price * params[1], 'tp': price * params[2]}
         else:
-            sl = None
-            tp = None
-        order_limits = {'sl': sl, 'tp': tp}
-        self.__logger.debug(f'order_limits: {order_limits}')
+            order_limits = {'sl': None, 'tp': None}
+        self.__logger.debug('order_limits: %s', order_limits)
         return order_limits
 
     def _determine_order_volume(self):
         bet_volume = self.betting_system.calculate_volume_by_pl(
             unit_volume=self.unit_volume, history_deals=self.history_deals
         )
-        self.__logger.debug(f'bet_volume: {bet_volume}')
+        self.__logger.debug('bet_volume: %s', bet_volume)
         return min(bet_volume, self.avail_volume)
 
     def _place_order(self, volume, side, **kwargs):
         self._send_or_check_order({
             'action': Mt5.TRADE_ACTION_DEAL,
             'symbol': self.symbol, 'volume': volume,
-            'type':
-            {'long': Mt5.ORDER_TYPE_BUY, 'short': Mt5.ORDER_TYPE_SELL}[side],
+            'type': _ORDER_SIDE_TYPES[side],
             'type_filling': Mt5.ORDER_FILLING_FOK,
             'type_time': Mt5.ORDER_TIME_GTC,
             **kwargs
@@ -314,93 +375,105 @@ class Mt5TraderCore(object):
             '|{0:^11}|{1:^29}|'.format(
                 self.symbol,
                 'B/A:{:>21}'.format(
-                    np.array2string(
-                        np.array([
-                            self.symbol_info_tick.bid,
-                            self.symbol_info_tick.ask
-                        ]),
-                        formatter={'float_kind': lambda f: f'{f:8g}'}
+                    '[{0:8g} {1:8g}]'.format(
+                        self.symbol_info_tick.bid, self.symbol_info_tick.ask
                     )
                 )
             ) + (add_str or '')
         )
 
     def print_log(self, data):
-        self.__logger.debug(f'console log: {data}')
+        self.__logger.debug('console log: %s', data)
         if not self.__quiet:
             print(data, flush=True)
 
     def is_margin_lack(self):
-        self._refresh_account_info_cache()
-        self._refresh_unit_margin_and_volume()
-        self._refresh_position_cache()
+        margin_free = self.account_info.margin_free
         return (
             (not self.positions) and (
-                self.unit_margin >= self.account_info.margin_free
-                or self.unit_volume == 0
+                self.unit_volume == 0
+                or self.unit_margin >= margin_free
                 or (
                     self.account_info.equity * self.__preserved_margin_ratio
-                    >= self.account_info.margin_free
+                    >= margin_free
                 )
             )
         )
 
-    def fetch_df_tick(self, tick_seconds=60, thin=True):
-        self._refresh_symbol_info_tick_cache()
+    def fetch_df_tick(self, tick_seconds=60, thin=True, refresh=True):
+        if refresh:
+            self._refresh_symbol_info_tick_cache()
         date_from = self.last_tick_time - timedelta(seconds=tick_seconds)
         date_to = self.last_tick_time + timedelta(seconds=tick_seconds)
         ticks = Mt5.copy_ticks_range(
             self.symbol, date_from, date_to, Mt5.COPY_TICKS_ALL
         )
-        self.__logger.debug(f'ticks: {ticks}')
+        self.__logger.debug('ticks: %s', ticks)
         if not isinstance(ticks, np.ndarray):
             raise Mt5ResponseError('Mt5.copy_ticks_range() failed.')
         else:
-            df_raw_tick = pd.DataFrame(ticks)
             df_tick = (
-                self._thin_df_tick(
-                    df_tick=df_raw_tick[['time', 'bid', 'ask']].assign(
-                        time=lambda d: pd.to_datetime(d['time'], unit='s')
+                self._thin_df_tick(ticks=ticks) if thin else pd.DataFrame(
+                    {'bid': ticks['bid'], 'ask': ticks['ask']},
+                    index=pd.Index(
+                        ticks['time_msc'].astype('datetime64[ms]'),
+                        name='time_msc'
                     )
-                ) if thin else df_raw_tick[['time_msc', 'bid', 'ask']].assign(
-                    time_msc=lambda d: pd.to_datetime(d['time_msc'], unit='ms')
-                ).set_index('time_msc')
+                )
             )
-            self.__logger.debug(f'df_tick.shape: {df_tick.shape}')
+            self.__logger.debug('df_tick.shape: %s', df_tick.shape)
             return df_tick
 
     @staticmethod
-    def _thin_df_tick(df_tick):
-        return df_tick.groupby('time').pipe(
-            lambda g: g.tail(1).set_index('time').join(
-                g.size().to_frame('tick_volume'), how='left'
+    def _thin_df_tick(ticks):
+        time_sec = ticks['time'].astype(np.int64)
+        if time_sec.shape[0] == 0:
+            last_indices = np.array([], dtype=np.int64)
+        else:
+            last_indices = np.append(
+                np.flatnonzero(time_sec[1:] != time_sec[:-1]),
+                (time_sec.shape[0] - 1)
+            )
+        return pd.DataFrame(
+            {
+                'bid': ticks['bid'][last_indices],
+                'ask': ticks['ask'][last_indices],
+                'tick_volume': np.diff(last_indices, prepend=-1)
+            },
+            index=pd.Index(
+                time_sec[last_indices].astype('datetime64[s]'), name='time'
             )
         )
 
     def fetch_df_rate(self, granularity='M1', count=10080):
         rates = Mt5.copy_rates_from_pos(
-            self.symbol, getattr(Mt5, f'TIMEFRAME_{granularity}'), 0, count
+            self.symbol, _TIMEFRAME_MAP[granularity], 0, count
         )
-        self.__logger.debug(f'rates: {rates}')
+        self.__logger.debug('rates: %s', rates)
         if not isinstance(rates, np.ndarray):
             raise Mt5ResponseError('Mt5.copy_rates_from_pos() failed.')
         else:
-            df_rate = pd.DataFrame(rates).drop(
-                columns='real_volume'
-            ).assign(
-                time=lambda d: pd.to_datetime(d['time'], unit='s')
-            ).set_index('time')
-            self.__logger.debug(f'df_rate.shape: {df_rate.shape}')
+            df_rate = pd.DataFrame(
+                {
+                    n: rates[n] for n in rates.dtype.names
+                    if n not in {'time', 'real_volume'}
+                },
+                index=pd.Index(
+                    rates['time'].astype('datetime64[s]'), name='time'
+                )
+            )
+            self.__logger.debug('df_rate.shape: %s', df_rate.shape)
             return df_rate
 
     def detect_trend_side(self, granularity='D1', count=30):
-        lr_coef = self.fetch_df_rate(
-            granularity=granularity, count=count
-        )[['close']].pipe(
-            lambda d:
-            scs.linregress(x=(d.index - d.index[0]).days, y=d['close'])
-        ).slope
-        self.__logger.debug(f'lr_coef: {lr_coef}')
+        df_rate = self.fetch_df_rate(granularity=granularity, count=count)
+        x = np.asarray(
+            (df_rate.index - df_rate.index[0]).days, dtype=np.float64
+        )
+        y = df_rate['close'].to_numpy(dtype=np.float64)
+        x_delta = x - x.mean()
+        lr_coef = np.dot(x_delta, (y - y.mean())) / np.dot(x_delta, x_delta)
+        self.__logger.debug('lr_coef: %s', lr_coef)
         return ('short' if lr_coef < 0 else 'long')
 
 
@@ -425,12 +498,15 @@ class AutoTrader(Mt5TraderCore):
         self.__hv_granularity = hv_granularity
         self.__hv_count = int(hv_count)
         self.__hv_ema_span = int(hv_ema_span)
+        self.__hv_bar_seconds = _granularity_to_seconds(hv_granularity)
+        self.__sleep_trigger_caches = dict()
         self.__max_spread_ratio = float(max_spread_ratio)
         self.__sleeping_ratio = float(sleeping_ratio)
         self.__interval_seconds = float(interval_seconds)
         self.__day_trend_suppressor = int(day_trend_suppressor or 0)
         self.__retry_count = int(retry_count)
-        self.__logger.debug('vars(self):' + os.linesep + pformat(vars(self)))
+        if self.__logger.isEnabledFor(logging.DEBUG):
+            self.__logger.debug('vars(self):\n%s', pformat(vars(self)))
 
     def invoke(self):
         self.print_log('!!! OPEN DEALS !!!')
@@ -447,6 +523,7 @@ class AutoTrader(Mt5TraderCore):
                             self.__logger.warning(
                                 f'Retry due to an MT5 response error: {e}'
                             )
+                            time.sleep(min((0.05 * (2 ** r)), 1))
                         else:
                             raise e
                     else:
@@ -462,9 +539,10 @@ class AutoTrader(Mt5TraderCore):
                 '-> {:.1f}% '.format(
                     round(
                         (
-                            self.min_margins[
-                                {'long': 'ask', 'short': 'bid'}[st['act']]
-                            ] / self.symbol_info.volume_min * new_volume
+                            (
+                                self.min_ask_margin if st['act'] == 'long'
+                                else self.min_bid_margin
+                            ) / self.symbol_info.volume_min * new_volume
                             / self.account_info.equity * 100
                         ),
                         1
@@ -487,19 +565,25 @@ class AutoTrader(Mt5TraderCore):
                         self.position_volumes['long']
                         - self.position_volumes['short']
                     ) / self.symbol_info.volume_min
-                    * self.min_margins[
-                        {'long': 'ask', 'short': 'bid'}[self.position_side]
-                    ] / self.account_info.equity * 100
+                    * (
+                        self.min_ask_margin if self.position_side == 'long'
+                        else self.min_bid_margin
+                    ) / self.account_info.equity * 100
                 ),
                 1
             ) if self.position_side else 0
         )
-        sleep_triggers = self._check_volume_and_volatility()
+        sleep_triggers = (
+            self._check_volume_and_volatility() if self.__sleeping_ratio
+            else pd.Series({'volume_ema': False, 'hv_ema': False})
+        )
         trend_side = (
             self.detect_trend_side(count=self.__day_trend_suppressor)
             if self.__day_trend_suppressor else None
         )
-        df_tick = self.fetch_df_tick(tick_seconds=self.__tick_seconds)
+        df_tick = self.fetch_df_tick(
+            tick_seconds=self.__tick_seconds, refresh=False
+        )
         sig = self.signal_detector.detect(
             df_tick=df_tick, position_side=self.position_side
         )
@@ -562,23 +646,34 @@ class AutoTrader(Mt5TraderCore):
         )
 
     def _has_over_spread(self):
-        spread_ratio = (
-            (self.symbol_info_tick.ask - self.symbol_info_tick.bid)
-            / (self.symbol_info_tick.ask + self.symbol_info_tick.bid) * 2
+        tick = self.symbol_info_tick
+        return (
+            (tick.ask - tick.bid) * 2
+            >= self.__max_spread_ratio * (tick.ask + tick.bid)
         )
-        self.__logger.debug(f'spread_ratio: {spread_ratio}')
-        return (spread_ratio >= self.__max_spread_ratio)
 
     def _check_volume_and_volatility(self):
-        return self.fetch_df_rate(
+        bar = self.symbol_info_tick.time // self.__hv_bar_seconds
+        cache = self.__sleep_trigger_caches.get(self.symbol)
+        if cache and cache[0] == bar:
+            return cache[1]
+        df_rate = self.fetch_df_rate(
             granularity=self.__hv_granularity, count=self.__hv_count
-        ).assign(
-            volume_ema=lambda d: d['tick_volume'].ewm(
-                span=self.__hv_ema_span, adjust=False
-            ).mean(skipna=True),
-            hv_ema=lambda d: np.log(d['close']).diff().ewm(
-                span=self.__hv_ema_span, adjust=False
-            ).std(ddof=1)
-        )[['volume_ema', 'hv_ema']].pipe(
-            lambda d: (d.iloc[-1] < d.quantile(self.__sleeping_ratio))
         )
+        volume_ema = df_rate['tick_volume'].ewm(
+            span=self.__hv_ema_span, adjust=False
+        ).mean()
+        hv_ema = pd.Series(
+            np.diff(np.log(df_rate['close'].to_numpy(dtype=np.float64)))
+        ).ewm(span=self.__hv_ema_span, adjust=False).std(ddof=1)
+        sleep_triggers = pd.Series({
+            'volume_ema': (
+                volume_ema.iloc[-1]
+                < volume_ema.quantile(self.__sleeping_ratio)
+            ),
+            'hv_ema': (
+                hv_ema.iloc[-1] < hv_ema.quantile(self.__sleeping_ratio)
+            )
+        })
+        self.__sleep_trigger_caches[self.symbol] = (bar, sleep_triggers)
+        return sleep_triggers
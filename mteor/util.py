@@ -2,8 +2,8 @@
 
 import json
 import logging
-
-import pandas as pd
+import os
+import sys
 
 
 class Mt5ResponseError(RuntimeError):
@@ -24,18 +24,37 @@ def set_log_config(debug=None, info=None):
 
 
 def print_json(data, indent=2):
-    print(json.dumps(data, indent=indent))
+    json.dump(data, sys.stdout, indent=indent)
+    sys.stdout.write('\n')
+    sys.stdout.flush()
 
 
 def print_df(df, csv_path=None, display_max_columns=500, display_width=1500):
+    import pandas as pd
     logger = logging.getLogger(__name__)
-    logger.debug(f'df.shape: {df.shape}')
-    logger.debug(f'df.dtypes: {df.dtypes}')
-    logger.debug(f'df: {df}')
-    pd.set_option('display.max_columns', display_max_columns)
-    pd.set_option('display.width', display_width)
-    pd.set_option('display.max_rows', df.shape[0])
-    print(df.reset_index().to_string(index=False))
+    logger.debug('df.shape: %s', df.shape)
+    logger.debug('df.dtypes: %s', df.dtypes)
+    logger.debug('df: %s', df)
+    has_default_index = isinstance(df.index, pd.RangeIndex)
+    with pd.option_context(
+            'display.max_columns', display_max_columns,
+            'display.width', display_width, 'display.max_rows', df.shape[0]):
+        sys.stdout.write(
+            (
+                df if has_default_index else df.reset_index()
+            ).to_string(index=False) + '\n'
+        )
     if csv_path:
-        logger.info(f'Write CSV data: {csv_path}')
-        df.to_csv(csv_path)
+        ext = os.path.splitext(csv_path)[1].lower()
+        if ext == '.feather':
+            logger.info(f'Write Feather data: {csv_path}')
+            (df if has_default_index else df.reset_index()).to_feather(
+                csv_path
+            )
+        elif ext == '.parquet':
+            logger.info(f'Write Parquet data: {csv_path}')
+            df.to_parquet(csv_path)
+        else:
+            logger.info(f'Write CSV data: {csv_path}')
+            with open(csv_path, 'w', buffering=(1 << 20), newline='') as f:
+                df.to_csv(f, index=(not has_default_index), chunksize=65536)